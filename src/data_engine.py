@@ -2,54 +2,199 @@
 data_engine.py (OOP Version)
 ----------------------------
 This version uses full OOP structure for database, multiprocessing,
-and threading operations.
+and asyncio operations.
 """
 
+import os
 import time
+import asyncio
+import queue
 import sqlite3
-from multiprocessing import Process
-from threading import Thread
-
-from sqlalchemy import Column, Integer, String, create_engine
-from sqlalchemy.orm import declarative_base, sessionmaker
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import closing, contextmanager
+from typing import Optional
+
+import aiofiles
+import aiohttp
+from sqlalchemy import create_engine, event, select
+from sqlalchemy.orm import (
+    DeclarativeBase,
+    Mapped,
+    MappedAsDataclass,
+    mapped_column,
+    sessionmaker,
+)
+from sqlalchemy.pool import QueuePool
+
+SQLITE_PATH = "streampy.db"
+PREMIUM_USERS_SQL = "SELECT id, name FROM users WHERE plan=?"
 
 # ORM Setup (Model)
-Base = declarative_base()
+class Base(MappedAsDataclass, DeclarativeBase, eq=False):
+    """
+    Declarative base; mapped classes are also dataclasses.
+    eq=False keeps identity equality and hashing, as plain ORM instances have.
+    """
+
 
 class SubscriptionPlan(Base):
-    """ORM model for subscription plans."""
+    """ORM model for subscription plans (dataclass-generated __repr__)."""
     __tablename__ = "subscription_plans"
 
-    id = Column(Integer, primary_key=True)
-    name = Column(String)
-
-    def __repr__(self):
-        return f"SubscriptionPlan(id={self.id}, name='{self.name}')"
+    id: Mapped[int] = mapped_column(primary_key=True, init=False)
+    name: Mapped[Optional[str]]
+
+
+# sqlite3 Connection Pool
+class _SqlitePool:
+    """Fixed-size pool of reusable sqlite3 connections, opened on first use."""
+
+    PRAGMAS = (
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=normal",
+        "PRAGMA temp_store=memory",
+        "PRAGMA cache_size=-64000",
+    )
+
+    def __init__(self, path, size=4):
+        self.path = path
+        self.size = size
+        self._connections = None
+        self._opened = []
+        self._lock = threading.Lock()
+
+    @classmethod
+    def _connect(cls, path):
+        """Open one connection and apply the pool pragmas."""
+        conn = sqlite3.connect(
+            path, check_same_thread=False, cached_statements=256
+        )
+        for pragma in cls.PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    def _fill(self):
+        """Open all pool connections (once, on the first acquire)."""
+        with self._lock:
+            if self._connections is None:
+                connections = queue.Queue(maxsize=self.size)
+                for _ in range(self.size):
+                    conn = self._connect(self.path)
+                    self._opened.append(conn)
+                    connections.put(conn)
+                self._connections = connections
+        return self._connections
+
+    @contextmanager
+    def acquire(self):
+        """Borrow a connection and return it to the pool afterwards."""
+        connections = self._connections or self._fill()
+        conn = connections.get()
+        try:
+            yield conn
+        finally:
+            connections.put(conn)
+
+    def close(self):
+        """Close every pooled connection; the next acquire opens a fresh set."""
+        with self._lock:
+            for conn in self._opened:
+                conn.close()
+            self._opened = []
+            self._connections = None
+
+    def all_connections(self):
+        """Every connection in the pool, borrowed or not (opens the pool if needed)."""
+        if self._connections is None:
+            self._fill()
+        return list(self._opened)
+
+
+# Query Guardrails
+@contextmanager
+def count_queries(engine):
+    """Collect every SQL statement the engine executes inside the block."""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+@contextmanager
+def count_sqlite_statements(sqlite_pool):
+    """Collect every raw sqlite3 statement run on the pool's connections inside the block."""
+    statements = []
+    connections = sqlite_pool.all_connections()
+    for conn in connections:
+        conn.set_trace_callback(statements.append)
+    try:
+        yield statements
+    finally:
+        for conn in connections:
+            conn.set_trace_callback(None)
+
+
+def explain_query_plan(sql, params=(), path=SQLITE_PATH):
+    """Return sqlite's EXPLAIN QUERY PLAN detail lines for a statement.
+
+    Uses a dedicated connection so the plan reflects the current schema
+    rather than one cached by a long-lived pooled connection.
+    """
+    with closing(sqlite3.connect(path)) as conn:
+        rows = conn.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+    return [row[-1] for row in rows]
 
 
 # Database Manager (OOP)
 class DatabaseManager:
     """Handles both ORM (SQLAlchemy) and raw SQL (sqlite3)."""
 
-    def __init__(self, db_path="sqlite:///streampy.db"):
-        self.engine = create_engine(db_path)
+    def __init__(self, db_path=f"sqlite:///{SQLITE_PATH}"):
+        self.engine = create_engine(
+            db_path, poolclass=QueuePool, pool_size=5, pool_pre_ping=True
+        )
         self.Session = sessionmaker(bind=self.engine)
+        # Raw sqlite3 access targets the same file as the engine. An in-memory
+        # database is private to each connection, so it cannot be shared or pooled.
+        database = self.engine.url.database
+        if database in (None, "", ":memory:"):
+            self.engine.dispose()
+            raise ValueError("DatabaseManager needs a file-backed sqlite URL, not an in-memory one")
+        self.pool = _SqlitePool(database)
+
+    def dispose(self):
+        """Release the engine's connections and the raw sqlite3 pool."""
+        self.engine.dispose()
+        self.pool.close()
 
     def setup_database(self):
         """Create tables and seed Subscription Plans."""
         Base.metadata.create_all(self.engine)
 
-        with self.Session() as session:
-            if session.query(SubscriptionPlan).count() == 0:
-                session.add_all([
-                    SubscriptionPlan(name="Basic"),
-                    SubscriptionPlan(name="Premium")
+        # Core-only existence check; no Session needed to learn this
+        with self.engine.connect() as conn:
+            has_rows = conn.execute(
+                select(SubscriptionPlan.__table__.c.id).limit(1)
+            ).first()
+
+        if not has_rows:
+            with self.Session() as session:
+                session.bulk_save_objects([
+                    SubscriptionPlan(name=n) for n in ("Basic", "Premium")
                 ])
                 session.commit()
 
     def seed_users(self):
         """Seed demo users using raw sqlite3 SQL."""
-        with sqlite3.connect("streampy.db") as conn:
+        with self.pool.acquire() as conn:
             cur = conn.cursor()
 
             cur.execute("""
@@ -59,31 +204,43 @@ class DatabaseManager:
                     plan TEXT
                 )
             """)
+            cur.execute("CREATE INDEX IF NOT EXISTS idx_users_plan ON users(plan)")
 
-            cur.execute("SELECT COUNT(*) FROM users")
-            if cur.fetchone()[0] == 0:
+            cur.execute("SELECT 1 FROM users LIMIT 1")
+            if cur.fetchone() is None:
                 users = [
                     (1, "Alice", "Premium"),
                     (2, "Bob", "Basic"),
                     (3, "Charlie", "Premium")
                 ]
-                cur.executemany("INSERT INTO users VALUES (?, ?, ?)", users)
-                conn.commit()
+                placeholders = ", ".join(["(?, ?, ?)"] * len(users))
+                params = [value for row in users for value in row]
+                with conn:
+                    conn.execute(f"INSERT INTO users VALUES {placeholders}", params)
 
     def get_premium_users(self):
         """Fetch Premium users using raw SQL."""
-        with sqlite3.connect("streampy.db") as conn:
+        with self.pool.acquire() as conn:
             cur = conn.cursor()
-            cur.execute("SELECT * FROM users WHERE plan=?", ("Premium",))
+            cur.execute(PREMIUM_USERS_SQL, ("Premium",))
             return cur.fetchall()
 
 
 # Multiprocessing Manager (OOP)
 class VideoEncoder:
-    """Handles CPU-heavy encoding using multiprocessing."""
+    """
+    Handles CPU-heavy encoding using multiprocessing.
+
+    Pure-Python encoding holds the GIL, so threads would run one at a
+    time; worker processes are used instead. If encode_file is backed by
+    a native kernel that releases the GIL (Cython `with nogil`, pybind11
+    `gil_scoped_release`), pass releases_gil=True to run on a thread pool
+    and skip process start-up and argument pickling.
+    """
 
-    def __init__(self, files):
+    def __init__(self, files, releases_gil=False):
         self.files = files
+        self.releases_gil = releases_gil
 
     @staticmethod
     def encode_file(file_name):
@@ -92,45 +249,90 @@ class VideoEncoder:
         time.sleep(2)
         print(f"[Encoding] Finished encoding {file_name}")
 
-    def start_encoding(self):
-        """Encodes all files in parallel."""
-        processes = [
-            Process(target=VideoEncoder.encode_file, args=(f,))
-            for f in self.files
-        ]
+    def _executor(self, workers):
+        """Thread pool for GIL-releasing kernels, spawn process pool otherwise."""
+        if self.releases_gil:
+            return ThreadPoolExecutor(max_workers=workers)
+        return ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
 
-        for p in processes:
-            p.start()
-
-        for p in processes:
-            p.join()
+    def start_encoding(self):
+        """Encodes all files in parallel on a bounded worker pool."""
+        if self.files:
+            workers = min(len(self.files), os.cpu_count() or 1)
+            with self._executor(workers) as executor:
+                list(executor.map(VideoEncoder.encode_file, self.files, chunksize=1))
 
         print("[Encoding] All encoding tasks completed.")
 
 
-# Threading Manager (OOP)
+# Asyncio Manager (OOP)
 class SubtitleDownloader:
-    """Handles subtitle download thread + main video buffering."""
-
-    def __init__(self, file_name):
-        self.file_name = file_name
+    """
+    Handles concurrent subtitle downloads + main video buffering.
 
-    def download(self):
-        """Task that runs on a separate thread."""
-        print(f"[Thread] Downloading subtitles for {self.file_name} ...")
-        time.sleep(1.5)
-        print(f"[Thread] Subtitles downloaded for {self.file_name}")
-
-    def simulate_stream(self):
-        """Main thread buffers while subtitle thread downloads."""
-        thread = Thread(target=self.download)
-        thread.start()
+    Subtitles are fetched from base_url ("{base_url}/{file_name}.srt").
+    Without a base_url the downloads are simulated, so the demo runs offline.
+    """
 
+    def __init__(self, files, base_url=None, dest_dir="subtitles"):
+        self.files = files
+        self.base_url = base_url.rstrip("/") if base_url else None
+        self.dest_dir = dest_dir
+
+    async def download(self, session, file_name):
+        """Stream one subtitle file into dest_dir without blocking the loop."""
+        print(f"[Async] Downloading subtitles for {file_name} ...")
+        if session is None:
+            await asyncio.sleep(1.5)  # Simulated download
+            print(f"[Async] Subtitles downloaded for {file_name}")
+            return
+
+        url = f"{self.base_url}/{file_name}.srt"
+        dest = os.path.join(self.dest_dir, f"{file_name}.srt")
+        partial = dest + ".part"  # Renamed into place only once the body is complete
+        try:
+            async with session.get(url) as resp:
+                resp.raise_for_status()
+                # Stream to disk in chunks; aiofiles keeps writes off the loop
+                async with aiofiles.open(partial, "wb") as f:
+                    async for chunk in resp.content.iter_chunked(1 << 16):
+                        await f.write(chunk)
+            os.replace(partial, dest)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            try:
+                os.unlink(partial)
+            except FileNotFoundError:
+                pass
+            print(f"[Async] Subtitle download failed for {file_name}: {e}")
+            return
+
+        print(f"[Async] Subtitles downloaded for {file_name}")
+
+    async def buffer_video(self):
+        """Main task buffers while subtitle downloads are in flight."""
         print("[Main] Video buffering... please wait.")
-        time.sleep(1)
+        await asyncio.sleep(1)
         print("[Main] Video is now playing!")
 
-        thread.join()
+    async def _download_all(self, session):
+        """Buffer the video while every subtitle download runs."""
+        await asyncio.gather(
+            self.buffer_video(),
+            *(self.download(session, f) for f in self.files),
+        )
+
+    async def simulate_stream(self):
+        """Download all subtitles concurrently on a single event loop."""
+        if self.base_url is None:
+            await self._download_all(None)
+        else:
+            os.makedirs(self.dest_dir, exist_ok=True)
+            timeout = aiohttp.ClientTimeout(total=10)
+            async with aiohttp.ClientSession(timeout=timeout) as session:
+                await self._download_all(session)
         print("[Main] All tasks done.")
 
 
@@ -141,10 +343,10 @@ class StreamPyEngine:
     def __init__(self):
         self.db = DatabaseManager()
         self.encoder = VideoEncoder(files=["video1.mp4", "video2.mp4", "video3.mp4"])
-        self.subtitles = SubtitleDownloader(file_name="video1.mp4")
+        self.subtitles = SubtitleDownloader(files=["video1.mp4", "video2.mp4", "video3.mp4"])
 
     def run(self):
-        # Setup database
+        # Setup database (query-count / index-plan guardrails live in tests/test_data_engine.py)
         self.db.setup_database()
         self.db.seed_users()
 
@@ -156,9 +358,9 @@ class StreamPyEngine:
         print("\n--- Video Encoding ---")
         self.encoder.start_encoding()
 
-        # Run threading
+        # Run asyncio
         print("\n--- Subtitle Download ---")
-        self.subtitles.simulate_stream()
+        asyncio.run(self.subtitles.simulate_stream())
 
 # Run
 if __name__ == "__main__":
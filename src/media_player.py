@@ -8,6 +8,7 @@ Demonstrates:
 - Polymorphism with `play()` in Movie and Series
 - Encapsulation using protected attribute `_stream_key` with property
 - Magic methods for developer-friendly object representation
+- __slots__ for compact, dict-free instances
 - Input validation and basic edge case handling
 """
 
@@ -24,6 +25,8 @@ class Content:
         _stream_key: Protected attribute for streaming access
     """
 
+    __slots__ = ("content_id", "title", "_stream_key")
+
     def __init__(self, content_id: int, title: str) -> None:
         """Initialize content with ID and title; validate inputs."""
         if not isinstance(content_id, int):
@@ -35,6 +38,17 @@ class Content:
         self.title: str = title
         self._stream_key: Optional[str] = None  
 
+    @classmethod
+    def _from_db(cls, content_id: int, title: str) -> "Content":
+        """
+        Build an instance from trusted storage (e.g. a SELECT row) without
+        re-running __init__ validation; use the constructor for user input.
+        """
+        obj = cls.__new__(cls)
+        obj.content_id = content_id
+        obj.title = title
+        obj._stream_key = None
+        return obj
 
     @property
     def stream_key(self) -> str:
@@ -54,6 +68,8 @@ class Content:
 class Movie(Content):
     """Represents a movie with a play() method."""
 
+    __slots__ = ()
+
     def play(self) -> None:
         """Play the movie if stream key is set; otherwise, warn."""
         if self._stream_key is None:
@@ -69,6 +85,8 @@ class Movie(Content):
 class Series(Content):
     """Represents a TV series with a play() method."""
 
+    __slots__ = ()
+
     def play(self, episode: int = 1) -> None:
         """Play a specific episode if stream key is set; validate episode."""
         if not isinstance(episode, int) or episode < 1:
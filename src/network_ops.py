@@ -4,7 +4,7 @@ network_ops.py
 Files, Network & System Operations for StreamPy
 
 This module demonstrates:
-- Sending POST requests (report_error)
+- Sending POST requests in the background (report_error)
 - Reading CSV user data
 - Checking/creating cache folder (os module)
 - Archiving old log files (zipfile)
@@ -12,9 +12,36 @@ This module demonstrates:
 """
 
 import os
+import sys
 import csv
+import queue
+import asyncio
+import threading
+import shutil
 import requests
 import zipfile
+from itertools import islice
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Shared HTTP session (keep-alive connection pool)
+_SESSION = requests.Session()
+_SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=10,
+        max_retries=Retry(total=2, backoff_factor=0.1),
+    ),
+)
+
+
+# ZipInfo's per-entry compression level; public as compress_level from Python 3.13
+_ZIPINFO_LEVEL_ATTR = "compress_level" if sys.version_info >= (3, 13) else "_compresslevel"
+
+
+# Regions where streaming is blocked (hash lookup, built once)
+_BLOCKED_REGIONS = frozenset({"US", "UK"})
 
 
 # 1. Custom Exception
@@ -24,18 +51,63 @@ class RegionBlockError(Exception):
 
 
 # 2. Web Request: POST error report
-def report_error(msg: str):
+ERROR_REPORT_URL = "https://jsonplaceholder.typicode.com/posts"
+_ERR_Q: queue.Queue[str] = queue.Queue(maxsize=1024)
+
+
+def _send_error(msg: str):
     """
     Sends an error message to a server using a POST request.
     """
     data = {"error": msg}
-    url = "https://jsonplaceholder.typicode.com/posts"
     try:
-        requests.post(url, data=data)
+        _SESSION.post(ERROR_REPORT_URL, json=data, timeout=(1.0, 2.0))
     except requests.RequestException as e:
         print(f"Request failed: {e}")
 
 
+def _error_worker():
+    """
+    Background loop that drains the error queue one report at a time.
+    """
+    while True:
+        msg = _ERR_Q.get()
+        try:
+            _send_error(msg)
+        finally:
+            _ERR_Q.task_done()
+
+
+threading.Thread(target=_error_worker, name="error-reporter", daemon=True).start()
+
+
+def report_error(msg: str):
+    """
+    Queues an error message for the background reporter and returns
+    immediately. Reports are dropped if the queue is full.
+    """
+    try:
+        _ERR_Q.put_nowait(msg)
+    except queue.Full:
+        pass
+
+
+async def areport_error(msg: str):
+    """
+    Async variant: sends the report on the default executor so the
+    event loop is never blocked by the HTTP round-trip.
+    """
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(None, _send_error, msg)
+
+
+def flush_error_reports():
+    """
+    Blocks until every queued error report has been sent.
+    """
+    _ERR_Q.join()
+
+
 # 3. CSV Reading: Print first 5 usernames
 def read_usernames():
     """
@@ -48,14 +120,12 @@ def read_usernames():
         print("CSV file not found:", path)
         return
 
-    with open(path, "r") as user_data:
+    with open(path, "r", newline="", buffering=1 << 20) as user_data:
         reader = csv.reader(user_data)
-        next(reader)  # Skip header
+        next(reader, None)  # Skip header
 
-        for i, row in enumerate(reader, start=1):
+        for row in islice(reader, 5):
             print(row[0])  # username column
-            if i == 5:
-                break
 
 
 # 4. OS & ZIP Operations
@@ -66,24 +136,36 @@ def manage_cache_and_logs():
     """
     cache_folder = "cache"
 
-    # Create cache folder if missing
-    if not os.path.exists(cache_folder):
+    # Create cache folder if missing (single mkdir, no exists() race)
+    try:
         os.makedirs(cache_folder)
         print("[Cache] Created 'cache/' folder.")
+    except FileExistsError:
+        pass
 
     # Archive log files if available
     logs_folder = "logs"
-    if os.path.exists(logs_folder):
-        zip_path = "logs_archive.zip"
-
-        with zipfile.ZipFile(zip_path, "w") as zipf:
-            for file in os.listdir(logs_folder):
-                full_path = os.path.join(logs_folder, file)
-                if os.path.isfile(full_path):
-                    zipf.write(full_path)
-                    print(f"[ZIP] Archived: {file}")
-    else:
+    zip_path = "logs_archive.zip"
+    try:
+        entries = os.scandir(logs_folder)
+    except FileNotFoundError:
         print("[Logs] No logs folder found, skipping archiving.")
+        return
+
+    with entries, zipfile.ZipFile(
+        zip_path, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=1
+    ) as zipf:
+        for entry in entries:
+            if entry.is_file(follow_symlinks=False):
+                # Keep the file's mtime and the archive's compression settings
+                info = zipfile.ZipInfo.from_file(entry.path, arcname=entry.name)
+                info.compress_type = zipf.compression
+                setattr(info, _ZIPINFO_LEVEL_ATTR, zipf.compresslevel)
+
+                with open(entry.path, "rb", buffering=0) as src, \
+                        zipf.open(info, "w", force_zip64=True) as dst:
+                    shutil.copyfileobj(src, dst, length=1 << 20)
+                print(f"[ZIP] Archived: {entry.name}")
 
 
 # 5. Region Block Demo Function
@@ -92,9 +174,7 @@ def access_content(country: str):
     Raises RegionBlockError for restricted regions.
     Example restricted region: 'US'
     """
-    blocked_regions = ["US", "UK"]
-
-    if country in blocked_regions:
+    if country in _BLOCKED_REGIONS:
         raise RegionBlockError(f"Content not available in your region: {country}")
 
     print(f"Content streamed successfully for region: {country}")
@@ -110,4 +190,6 @@ if __name__ == "__main__":
     try:
         access_content("US")
     except RegionBlockError as e:
-        print("Error:", e)
\ No newline at end of file
+        print("Error:", e)
+
+    flush_error_reports()
\ No newline at end of file
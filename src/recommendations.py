@@ -2,16 +2,33 @@
 recommendations.py
 -------------------
 Functional utilities for StreamPy: lookup tables, playlist duration, kids filter.
+Large catalogs can also be packed into struct-of-arrays columns (build_soa) and
+processed with NumPy / Numba kernels.
 """
 
 import logging
 import json
-from functools import reduce
+import mmap
+import os
+from dataclasses import dataclass
+from functools import lru_cache
 from typing import List, Dict, Any
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; stdlib json is the fallback parser
+    orjson = None
+
+# NumPy / Numba are optional and slow to import (~90 ms / ~250 ms), so they are
+# imported on first use by _numpy() and _soa_kernels(), never at module import.
+np = None
+
+# Project root, resolved once
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
 # Configure logging
-LOG_FILE = Path(__file__).parent.parent / "logs" / "recommendations.log"
+LOG_FILE = PROJECT_ROOT / "logs" / "recommendations.log"
 LOG_FILE.parent.mkdir(exist_ok=True)
 logging.basicConfig(
     filename=LOG_FILE,
@@ -20,21 +37,126 @@ logging.basicConfig(
 )
 
 # Path to the JSON data file
-MOVIES_FILE = Path(__file__).parent.parent / "data" / "movies.json"
+MOVIES_FILE = PROJECT_ROOT / "data" / "movies.json"
+
+# Catalog files at least this large are parsed straight from an mmap
+MMAP_MIN_BYTES = 1 << 20
+
+# Playlists at least this long are summed with NumPy; below it call overhead dominates
+NUMPY_MIN_ITEMS = 256
+
+# int64 accumulators wrap silently past this; larger sums use Python ints
+_INT64_MAX = (1 << 63) - 1
+
+# int8 rating codes used by the SoA catalog; unknown ratings map to NR
+RATING_G, RATING_PG, RATING_PG13, RATING_R, RATING_NR, RATING_NC17, RATING_TVMA, RATING_X = range(8)
+_RATING_CODES = {
+    "G": RATING_G, "PG": RATING_PG, "PG-13": RATING_PG13, "R": RATING_R, "NR": RATING_NR,
+    "NC-17": RATING_NC17, "TV-MA": RATING_TVMA, "X": RATING_X,
+}
+
+# Ratings hidden from kids profiles
+_BLOCKED_RATING_CODES = frozenset({RATING_R, RATING_NC17, RATING_TVMA, RATING_X})
+
+
+@lru_cache(maxsize=None)
+def _numpy():
+    """Import NumPy on first call and bind it to the module-level np; None if missing."""
+    global np
+    try:
+        import numpy
+    except ImportError:  # NumPy is optional; the pure-Python paths always work
+        return None
+    np = numpy
+    return numpy
+
+
+def _parse_json_file(f) -> Any:
+    """
+    Parse an open binary file with orjson (via mmap when large), else stdlib json.
+    orjson rejects some input stdlib json accepts (NaN, Infinity); such files are
+    re-parsed with json so the result doesn't depend on orjson being installed.
+    One difference remains: with orjson, integers beyond 64 bits parse as floats.
+    """
+    if orjson is None:
+        return json.load(f)
+    size = os.fstat(f.fileno()).st_size
+    if size and size >= MMAP_MIN_BYTES:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            with memoryview(mm) as view:
+                try:
+                    return orjson.loads(view)
+                except orjson.JSONDecodeError:
+                    pass
+            return json.loads(mm[:])
+    data = f.read()
+    try:
+        return orjson.loads(data)
+    except orjson.JSONDecodeError:
+        return json.loads(data)
+
+
+@lru_cache(maxsize=1)
+def _load_movies_cached(path: str, mtime_ns: int, size: int) -> List[Dict[str, Any]]:
+    """Parse and normalize one version of a catalog file; only the latest version is kept."""
+    with open(path, "rb") as f:
+        movies = _parse_json_file(f)
+    if not isinstance(movies, list) or not all(isinstance(m, dict) for m in movies):
+        raise TypeError("movies file must hold a JSON list of objects")
+    for movie in movies:
+        movie["title"] = _clean_field(movie.get("title", "Unknown"), "Unknown")
+        movie["rating"] = _clean_field(movie.get("rating", "NR"), "NR")
+        movie["_rating_code"] = _movie_rating_code(movie)
+    return movies
 
 
 def load_movies() -> List[Dict[str, Any]]:
-    """Load movies from JSON file. Returns empty list if file is missing or invalid."""
+    """
+    Load movies from JSON file. Returns empty list if file is missing, invalid,
+    or not a list of movie objects.
+    Titles/ratings are normalized once here ("Unknown"/"NR" defaults, stripped) and
+    each movie gets a precomputed "_rating_code", which also marks it as normalized.
+    The parsed catalog is cached until the file changes; each call returns a new
+    list, but the movie dicts are shared between calls and should be treated as read-only.
+    """
     try:
-        with open(MOVIES_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
+        st = os.stat(MOVIES_FILE)
+        return list(_load_movies_cached(str(MOVIES_FILE), st.st_mtime_ns, st.st_size))
     except FileNotFoundError:
         logging.error("Movies file not found: %s", MOVIES_FILE)
-    except json.JSONDecodeError:
+    except json.JSONDecodeError:  # orjson.JSONDecodeError subclasses this
         logging.error("Invalid JSON in movies file: %s", MOVIES_FILE)
+    except TypeError:
+        logging.error("Movies file is not a list of movie objects: %s", MOVIES_FILE)
     return []
 
 
+def _clean_field(value: Any, default: str) -> str:
+    """Normalize a title/rating value: stringified and stripped, default if empty."""
+    return str(value).strip() or default
+
+
+@lru_cache(maxsize=1024)
+def _rating_code(rating: Any) -> int:
+    """
+    Map a raw rating to its int code. Case-insensitive, whitespace-safe; unknown -> NR.
+    Cached per raw value, so each distinct spelling is normalized only once.
+    """
+    return _RATING_CODES.get(str(rating).strip().upper(), RATING_NR)
+
+
+def _movie_rating_code(movie: Dict[str, Any]) -> int:
+    """Rating code of a movie, using the one precomputed by load_movies when present."""
+    code = movie.get("_rating_code")
+    if code is None:
+        rating = movie.get("rating", "")
+        try:
+            code = _rating_code(rating)
+        except TypeError:  # Unhashable rating value; normalize without the cache
+            code = _rating_code.__wrapped__(rating)
+    return code
+
+
 def _safe_duration(value: Any) -> int:
     """Convert value to non-negative int; invalid or negative -> 0. Logs warning if conversion fails."""
     try:
@@ -48,34 +170,224 @@ def _safe_duration(value: Any) -> int:
         return 0
 
 
+def _int64_sum_may_overflow(durations) -> bool:
+    """True if summing a non-negative int64 array could wrap (max * len > int64 max)."""
+    return durations.shape[0] > 0 and int(durations.max()) * durations.shape[0] > _INT64_MAX
+
+
+def _is_records(movies: List[Any]) -> bool:
+    """True if the list holds MovieRecord objects rather than movie dicts."""
+    return bool(movies) and isinstance(movies[0], MovieRecord)
+
+
 def lookup_table(movies: List[Dict[str, Any]]) -> Dict[str, str]:
-    """Return {title: rating} dictionary. Input: list of movie dicts."""
-    return {
-        str(movie.get("title", "Unknown")).strip() or "Unknown":
-        str(movie.get("rating", "NR")).strip() or "NR"
-        for movie in movies
-    }
+    """Return {title: rating} dictionary. Input: list of movie dicts or MovieRecords."""
+    if _is_records(movies):
+        return {m.title: m.rating for m in movies}
+
+    table = {}
+    for movie in movies:
+        if "_rating_code" in movie:  # Already normalized by load_movies
+            table[movie["title"]] = movie["rating"]
+            continue
+        # Subscript + KeyError is cheaper than .get() when the key is usually present
+        try:
+            title = movie["title"]
+        except KeyError:
+            title = "Unknown"
+        try:
+            rating = movie["rating"]
+        except KeyError:
+            rating = "NR"
+        table[_clean_field(title, "Unknown")] = _clean_field(rating, "NR")
+    return table
 
 
 def total_duration(playlist: List[Dict[str, Any]]) -> int:
-    """Sum durations of all movies safely, treating missing or invalid values as 0."""
-    return reduce(
-        lambda total, movie: total + _safe_duration(movie.get("duration", 0)),
-        playlist,
-        0
-    )
+    """
+    Sum durations of all movies safely, treating missing or invalid values as 0.
+    Accepts movie dicts or MovieRecords (whose durations are already safe).
+    """
+    if _is_records(playlist):
+        return sum(m.duration for m in playlist)
+
+    if len(playlist) >= NUMPY_MIN_ITEMS and _numpy() is not None:
+        try:
+            durations = np.fromiter(
+                (movie.get("duration", 0) for movie in playlist),
+                dtype=np.int64,
+                count=len(playlist),
+            )
+        except (TypeError, ValueError, OverflowError):
+            pass  # Invalid values present; the safe path below logs each one
+        else:
+            negatives = int(np.count_nonzero(durations < 0))
+            if negatives:
+                logging.warning("%d negative durations encountered. Converted to 0.", negatives)
+            durations = np.clip(durations, 0, None)
+            if _int64_sum_may_overflow(durations):
+                return sum(durations.tolist())  # Exact Python ints
+            return int(np.add.reduce(durations))
+
+    safe = _safe_duration
+    total = 0
+    for movie in playlist:
+        try:
+            value = movie["duration"]
+        except KeyError:
+            continue  # Missing duration counts as 0
+        total += safe(value)
+    return total
 
 
 def kids_profile_filter(movies: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    """Return list of movies excluding R-rated content. Case-insensitive, whitespace-safe."""
-    return list(
-        filter(
-            lambda m: str(m.get("rating", "")).strip().upper() != "R",
-            movies
+    """
+    Return list of movies excluding adult content (R, NC-17, TV-MA, X).
+    Case-insensitive, whitespace-safe. Accepts movie dicts or MovieRecords.
+    """
+    rating_code = _rating_code
+    blocked = _BLOCKED_RATING_CODES
+    if _is_records(movies):
+        return [m for m in movies if rating_code(m.rating) not in blocked]
+
+    # Precomputed codes are read inline; only rows without one are normalized
+    try:
+        return [
+            m for m in movies
+            if (
+                rating_code(m.get("rating", ""))
+                if (code := m.get("_rating_code")) is None else code
+            ) not in blocked
+        ]
+    except TypeError:  # An unhashable rating; redo the pass without the cache
+        normalize = _movie_rating_code
+        return [m for m in movies if normalize(m) not in blocked]
+
+
+# Typed movie records
+
+@dataclass(slots=True)
+class MovieRecord:
+    """
+    Compact, dict-free movie record; fields are normalized once at construction.
+    lookup_table, total_duration and kids_profile_filter take lists of these directly.
+    """
+    title: str
+    genre: str
+    rating: str
+    duration: int
+
+    @classmethod
+    def from_dict(cls, movie: Dict[str, Any]) -> "MovieRecord":
+        """Build a record from a raw movie dict using the same defaults as the dict helpers."""
+        return cls(
+            title=_clean_field(movie.get("title", "Unknown"), "Unknown"),
+            genre=_clean_field(movie.get("genre", ""), ""),
+            rating=_clean_field(movie.get("rating", "NR"), "NR"),
+            duration=_safe_duration(movie.get("duration", 0)),
         )
+
+
+def load_movie_records() -> List[MovieRecord]:
+    """Load the catalog as MovieRecord objects instead of dicts."""
+    return [MovieRecord.from_dict(movie) for movie in load_movies()]
+
+
+# Struct-of-arrays catalog + JIT kernels
+
+@dataclass
+class CatalogArrays:
+    """Column view of a catalog: one NumPy array per field, plus the source dicts."""
+    movies: List[Dict[str, Any]]
+    titles: "np.ndarray"
+    ratings_code: "np.ndarray"
+    durations: "np.ndarray"
+
+
+def build_soa(movies: List[Dict[str, Any]]) -> CatalogArrays:
+    """Pack movie dicts into NumPy columns once, applying the same normalization as above."""
+    if _numpy() is None:
+        raise ImportError("build_soa requires NumPy")
+    count = len(movies)
+    return CatalogArrays(
+        movies=movies,
+        titles=np.array(
+            [_clean_field(m.get("title", "Unknown"), "Unknown") for m in movies],
+            dtype=object,
+        ),
+        ratings_code=np.fromiter(
+            (_movie_rating_code(m) for m in movies),
+            dtype=np.int8,
+            count=count,
+        ),
+        durations=np.fromiter(
+            (_safe_duration(m.get("duration", 0)) for m in movies),
+            dtype=np.int64,
+            count=count,
+        ),
     )
 
 
+def _sum_durations(durations):
+    """Sum an int64 duration column."""
+    total = 0
+    for i in range(durations.shape[0]):
+        total += durations[i]
+    return total
+
+
+def _kids_mask(ratings_code, allowed):
+    """Boolean mask of rows whose rating code is allowed (allowed[code] lookup table)."""
+    out = np.empty(ratings_code.shape[0], np.bool_)
+    for i in range(ratings_code.shape[0]):
+        out[i] = allowed[ratings_code[i]]
+    return out
+
+
+@lru_cache(maxsize=None)
+def _soa_kernels():
+    """
+    Build the SoA kernels on first use: (sum_durations, kids_mask, kids_allowed).
+    Numba is imported and the loops above compiled here; without it, NumPy equivalents.
+    """
+    if _numpy() is None:
+        raise ImportError("SoA kernels require NumPy")
+    try:
+        from numba import njit
+    except ImportError:  # Numba is optional; SoA kernels fall back to NumPy
+        njit = None
+
+    if njit is not None:
+        sum_durations = njit(cache=True)(_sum_durations)
+        kids_mask = njit(cache=True)(_kids_mask)
+    else:
+        sum_durations = np.add.reduce
+
+        def kids_mask(ratings_code, allowed):
+            return allowed[ratings_code]
+
+    # allowed[code] lookup table for kids_mask
+    kids_allowed = np.array(
+        [code not in _BLOCKED_RATING_CODES for code in range(len(_RATING_CODES))],
+        dtype=np.bool_,
+    )
+    return sum_durations, kids_mask, kids_allowed
+
+
+def catalog_total_duration(catalog: CatalogArrays) -> int:
+    """Total duration of a packed catalog (durations are already non-negative)."""
+    if _int64_sum_may_overflow(catalog.durations):
+        return sum(catalog.durations.tolist())  # Exact Python ints
+    sum_durations, _, _ = _soa_kernels()
+    return int(sum_durations(catalog.durations))
+
+
+def kids_profile_indices(catalog: CatalogArrays) -> "np.ndarray":
+    """Row indices of kids-safe movies; index catalog.movies to materialize dicts on demand."""
+    _, kids_mask, kids_allowed = _soa_kernels()
+    return np.nonzero(kids_mask(catalog.ratings_code, kids_allowed))[0]
+
+
 if __name__ == "__main__":
     MOVIES_DATA = load_movies()
     print("Lookup Table:", lookup_table(MOVIES_DATA))
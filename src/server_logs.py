@@ -4,30 +4,57 @@ server_logs.py
 Demonstrates:
 
 - Decorators for execution-time logging with error capture
+- Non-blocking log output via QueueHandler / QueueListener, attached lazily
 - Threshold-based logging (WARNING if runtime > 1 second)
 - Deque for maintaining recently watched items
-- defaultdict for grouping comments by video ID
+- Dict of lists for grouping comments by video ID
 """
 
+import atexit
 import logging
+import queue
+import sys
+import threading
 import time
 import os
+from logging.handlers import QueueHandler, QueueListener
 from functools import wraps
-from collections import deque, defaultdict
-from typing import Callable, Any
-
-
-# Ensure logs directory exists
-os.makedirs("logs", exist_ok=True)
+from collections import deque
+from typing import Callable, Any, Optional
 
 
 # Logging Configuration
-logging.basicConfig(
-    filename="logs/server.log",
-    level=logging.INFO,
-    format="%(asctime)s | %(levelname)s | %(message)s"
-)
+# Callers only enqueue records; a background listener thread does the file I/O.
+# Nothing touches the disk at import: the handler is attached on first use.
 logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+_listener: Optional[QueueListener] = None
+_listener_lock = threading.Lock()
+
+
+def _ensure_logging() -> None:
+    """Create logs/ and start the queued file handler once, on first call."""
+    global _listener
+    if _listener is not None:
+        return
+
+    with _listener_lock:
+        if _listener is not None:
+            return
+
+        os.makedirs("logs", exist_ok=True)
+        log_queue: queue.SimpleQueue = queue.SimpleQueue()
+        file_handler = logging.FileHandler("logs/server.log")
+        file_handler.setFormatter(logging.Formatter("%(asctime)s | %(levelname)s | %(message)s"))
+
+        listener = QueueListener(log_queue, file_handler, respect_handler_level=True)
+        listener.start()
+        atexit.register(listener.stop)
+        logger.addHandler(QueueHandler(log_queue))
+        # Records go through the queue only; root handlers would write them synchronously
+        logger.propagate = False
+        _listener = listener
 
 
 # Decorator for execution-time measurement + exception logging
@@ -41,21 +68,21 @@ def log_execution(func: Callable) -> Callable:
 
     @wraps(func)
     def wrapper(*args, **kwargs) -> Any:
-        start = time.time()
+        _ensure_logging()
+        start = time.perf_counter_ns()
 
         try:
             result = func(*args, **kwargs)
         except Exception as e:
-            logger.error(f"{func.__name__} failed: {e}")
+            logger.error("%s failed: %s", func.__name__, e)
             raise  # Re-raise so calling code still sees the failure
 
-        duration = time.time() - start
-        message = f"{func.__name__} took {duration:.2f} seconds"
+        elapsed_ns = time.perf_counter_ns() - start
+        level = logging.WARNING if elapsed_ns > 1_000_000_000 else logging.INFO
 
-        if duration > 1:
-            logger.warning(message)
-        else:
-            logger.info(message)
+        # Skip building the record entirely when this level is filtered out
+        if logger.isEnabledFor(level):
+            logger.log(level, "%s took %.2f seconds", func.__name__, elapsed_ns * 1e-9)
 
         return result
 
@@ -81,25 +108,36 @@ class RecentlyWatched:
         if max_items <= 0:
             raise ValueError("max_items must be greater than zero.")
         self.history: deque[str] = deque(maxlen=max_items)
+        self._append = self.history.append  # bound once, reused by add()
 
     def add(self, video_title: str) -> None:
         """Add a non-empty video title to the history."""
+        # Fast path: exact str type and non-blank, no string copies.
+        # Titles repeat across events, so intern them to share one object.
+        if type(video_title) is str and video_title and not video_title.isspace():
+            video_title = sys.intern(video_title)
+        else:
+            self._validate(video_title)
+
+        self._append(video_title)
+
+    @staticmethod
+    def _validate(video_title: str) -> None:
+        """Slow path: raise the precise error, or accept str subclasses."""
         if not isinstance(video_title, str):
             raise TypeError("video_title must be a string.")
         if not video_title.strip():
             raise ValueError("video_title cannot be empty.")
 
-        self.history.append(video_title)
-
     def get_history(self) -> list[str]:
         """Return a list of recently watched items."""
         return list(self.history)
 
 
-# Comment Store (defaultdict implementation)
+# Comment Store (dict of lists implementation)
 class CommentStore:
     """
-    Stores user comments grouped by video ID using defaultdict(list).
+    Stores user comments grouped by video ID in a plain dict of lists.
     Structure:
         {
             "VID23": ["Nice!", "Awesome"],
@@ -108,11 +146,30 @@ class CommentStore:
     """
 
     def __init__(self) -> None:
-        self.comments: defaultdict[str, list[str]] = defaultdict(list)
+        self.comments: dict[str, list[str]] = {}
 
     def add_comment(self, video_id: str, comment: str) -> None:
         """Add a validated comment under a specific video ID."""
+        # Fast path: exact str types and non-blank values, no string copies.
+        # Interned IDs share one object, so dict probes hit the identity check.
+        if (
+            type(video_id) is str and type(comment) is str
+            and video_id and comment
+            and not video_id.isspace() and not comment.isspace()
+        ):
+            video_id = sys.intern(video_id)
+        else:
+            self._validate(video_id, comment)
 
+        # get + None check: no __missing__ dispatch when a new video ID arrives
+        bucket = self.comments.get(video_id)
+        if bucket is None:
+            self.comments[video_id] = bucket = []
+        bucket.append(comment)
+
+    @staticmethod
+    def _validate(video_id: str, comment: str) -> None:
+        """Slow path: raise the precise error, or accept str subclasses."""
         if not isinstance(video_id, str):
             raise TypeError("video_id must be a string.")
         if not video_id.strip():
@@ -123,8 +180,6 @@ class CommentStore:
         if not comment.strip():
             raise ValueError("comment cannot be empty.")
 
-        self.comments[video_id].append(comment)
-
     def get_comments(self, video_id: str) -> list[str]:
         """Return comments for a specific video ID."""
         return self.comments.get(video_id, [])
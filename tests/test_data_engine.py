@@ -0,0 +1,196 @@
+"""
+test_data_engine.py
+-------------------
+Query guardrails for data_engine.py's DatabaseManager, run against a temporary database.
+
+Covers:
+- SubscriptionPlan keeps identity equality and hashing
+- statement counts for setup_database (SQLAlchemy) and seed_users / get_premium_users (raw sqlite3)
+- the premium-user lookup is served by idx_users_plan
+- the sqlite3 pool follows db_path, opens lazily and closes on dispose()
+- VideoEncoder's thread-pool path for GIL-releasing kernels
+- SubtitleDownloader keeps only complete downloads (local aiohttp server)
+"""
+
+import asyncio
+import sqlite3
+
+import pytest
+from src.data_engine import (
+    PREMIUM_USERS_SQL,
+    DatabaseManager,
+    SubscriptionPlan,
+    SubtitleDownloader,
+    VideoEncoder,
+    count_queries,
+    count_sqlite_statements,
+    explain_query_plan,
+)
+
+
+@pytest.fixture
+def db(tmp_path):
+    """DatabaseManager backed by a fresh database file under tmp_path."""
+    manager = DatabaseManager(db_path=f"sqlite:///{tmp_path / 'streampy.db'}")
+    yield manager
+    manager.dispose()
+
+
+# ORM model
+
+def test_subscription_plan_identity_eq_and_repr():
+    """Dataclass mapping keeps identity eq/hash like plain ORM instances, plus a field repr."""
+    a, b = SubscriptionPlan(name="Basic"), SubscriptionPlan(name="Basic")
+    assert a != b and a == a
+    assert len({a, b}) == 2
+    assert repr(a) == "SubscriptionPlan(id=None, name='Basic')"
+
+
+# Statement counts
+
+def test_setup_database_query_count(db):
+    """Setup creates and seeds plans in a bounded number of queries, with one INSERT."""
+    with count_queries(db.engine) as queries:
+        db.setup_database()
+    assert len(queries) <= 5, queries
+    assert sum(q.lstrip().startswith("INSERT") for q in queries) == 1
+
+
+def test_setup_database_already_seeded(db):
+    """A second setup only checks for existing rows and inserts nothing."""
+    db.setup_database()
+    with count_queries(db.engine) as queries:
+        db.setup_database()
+    assert not any(q.lstrip().startswith("INSERT") for q in queries)
+
+
+def test_seed_users_statement_count(db):
+    """Seeding users issues one multi-row INSERT inside a single transaction."""
+    with count_sqlite_statements(db.pool) as statements:
+        db.seed_users()
+    assert len(statements) <= 6, statements
+    assert sum(s.lstrip().startswith("INSERT") for s in statements) == 1
+
+
+def test_seed_users_already_seeded(db):
+    """Re-seeding only runs the schema statements and the existence check."""
+    db.seed_users()
+    with count_sqlite_statements(db.pool) as statements:
+        db.seed_users()
+    assert len(statements) <= 3, statements
+    assert not any(s.lstrip().startswith("INSERT") for s in statements)
+
+
+def test_get_premium_users_single_statement(db):
+    """Premium lookup is one SELECT returning only id and name."""
+    db.seed_users()
+    with count_sqlite_statements(db.pool) as statements:
+        users = db.get_premium_users()
+    assert users == [(1, "Alice"), (3, "Charlie")]
+    assert len(statements) == 1, statements
+
+
+# Query plan
+
+def test_premium_users_uses_plan_index(db):
+    """The plan filter is answered from idx_users_plan, not a table scan."""
+    db.seed_users()
+    plan = explain_query_plan(PREMIUM_USERS_SQL, ("Premium",), path=db.pool.path)
+    assert any("USING INDEX idx_users_plan" in step for step in plan), plan
+
+
+# sqlite3 pool
+
+def test_pool_follows_db_path_and_opens_lazily(tmp_path):
+    """No database file is created until the pool is first used, and it is the manager's file."""
+    path = tmp_path / "lazy.db"
+    manager = DatabaseManager(db_path=f"sqlite:///{path}")
+    assert manager.pool.path == str(path)
+    assert not path.exists()
+
+    manager.seed_users()
+    assert path.exists()
+    manager.dispose()
+
+
+@pytest.mark.parametrize("url", ["sqlite://", "sqlite:///:memory:"])
+def test_in_memory_url_rejected(url):
+    """In-memory databases cannot be shared with the sqlite3 pool, so they are refused."""
+    with pytest.raises(ValueError):
+        DatabaseManager(db_path=url)
+
+
+def test_dispose_closes_pool_connections(db):
+    """dispose() closes the pooled sqlite3 connections; the pool reopens on next use."""
+    db.seed_users()
+    connections = db.pool.all_connections()
+    db.dispose()
+    for conn in connections:
+        with pytest.raises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
+    assert db.get_premium_users() == [(1, "Alice"), (3, "Charlie")]
+
+
+# VideoEncoder
+
+def test_start_encoding_on_thread_pool(monkeypatch, capsys):
+    """releases_gil=True runs every file through encode_file on worker threads."""
+    encoded = []
+    monkeypatch.setattr(VideoEncoder, "encode_file", staticmethod(encoded.append))
+
+    VideoEncoder(files=["a.mp4", "b.mp4", "c.mp4"], releases_gil=True).start_encoding()
+    assert sorted(encoded) == ["a.mp4", "b.mp4", "c.mp4"]
+    assert "All encoding tasks completed" in capsys.readouterr().out
+
+
+# SubtitleDownloader
+
+async def _serve_subtitles_and_download(tmp_path, files):
+    """Serve one good and one truncated subtitle from a local aiohttp app, then download them."""
+    from aiohttp import web
+
+    async def good(request):
+        return web.Response(body=b"1\n00:00:01,000 --> 00:00:02,000\nHi\n")
+
+    async def truncated(request):
+        resp = web.StreamResponse(headers={"Content-Length": "1000"})
+        await resp.prepare(request)
+        await resp.write(b"1\n00:00:01")
+        request.transport.close()  # Drop the connection mid-body
+        return resp
+
+    app = web.Application()
+    app.router.add_get("/good.mp4.srt", good)
+    app.router.add_get("/cut.mp4.srt", truncated)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = runner.addresses[0][1]
+    try:
+        downloader = SubtitleDownloader(
+            files, base_url=f"http://127.0.0.1:{port}/", dest_dir=str(tmp_path / "subs")
+        )
+        await downloader.simulate_stream()
+    finally:
+        await runner.cleanup()
+
+
+def test_subtitle_download_keeps_only_complete_files(tmp_path, capsys):
+    """Complete bodies land at dest; truncated or missing ones leave no file behind."""
+    asyncio.run(_serve_subtitles_and_download(tmp_path, ["good.mp4", "cut.mp4", "missing.mp4"]))
+
+    subs = tmp_path / "subs"
+    assert sorted(p.name for p in subs.iterdir()) == ["good.mp4.srt"]
+    assert (subs / "good.mp4.srt").read_bytes().endswith(b"Hi\n")
+    out = capsys.readouterr().out
+    assert "download failed for cut.mp4" in out
+    assert "download failed for missing.mp4" in out
+
+
+def test_subtitle_download_simulated_without_base_url(tmp_path, capsys):
+    """Without a base_url nothing is fetched or written."""
+    downloader = SubtitleDownloader(["v1.mp4"], dest_dir=str(tmp_path / "subs"))
+    asyncio.run(downloader.simulate_stream())
+    assert not (tmp_path / "subs").exists()
+    assert "Subtitles downloaded for v1.mp4" in capsys.readouterr().out
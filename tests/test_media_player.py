@@ -37,6 +37,23 @@ def test_set_invalid_stream_key():
         content.stream_key = None  # invalid type
 
 
+def test_content_uses_slots():
+    """Content and subclasses should not carry a per-instance __dict__."""
+    for obj in (Content(5, "Slim"), Movie(6, "Slim"), Series(7, "Slim")):
+        assert not hasattr(obj, "__dict__")
+        with pytest.raises(AttributeError):
+            obj.unknown_attr = 1
+
+
+def test_from_db_builds_unvalidated_instance():
+    """_from_db should return the right subclass with no stream key set."""
+    movie = Movie._from_db(103, "Dune")
+    assert isinstance(movie, Movie)
+    assert (movie.content_id, movie.title) == (103, "Dune")
+    assert movie._stream_key is None
+    assert repr(movie) == "Movie(id=103, title='Dune')"
+
+
 
 # Movie Class Tests
 
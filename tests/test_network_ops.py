@@ -0,0 +1,90 @@
+"""
+test_network_ops.py
+-------------------
+Unit tests for network_ops.py using pytest.
+
+Covers:
+- manage_cache_and_logs creates cache/ and archives logs/ with deflate
+- report_error queues without blocking and drops reports when the queue is full
+- access_content region blocking
+"""
+
+import queue
+import time
+import zipfile
+
+import pytest
+from src import network_ops
+from src.network_ops import (
+    RegionBlockError,
+    access_content,
+    manage_cache_and_logs,
+    report_error,
+)
+
+
+# manage_cache_and_logs tests
+
+def test_archive_logs_deflated_round_trip(tmp_path, monkeypatch):
+    """Log files are archived with ZIP_DEFLATED and their contents round-trip."""
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "logs").mkdir()
+    body = b"2024-01-01 | INFO | slow_function took 2.00 seconds\n" * 5000
+    (tmp_path / "logs" / "server.log").write_bytes(body)
+
+    manage_cache_and_logs()
+
+    assert (tmp_path / "cache").is_dir()
+    with zipfile.ZipFile(tmp_path / "logs_archive.zip") as zipf:
+        (info,) = zipf.infolist()
+        assert info.filename == "server.log"
+        assert info.compress_type == zipfile.ZIP_DEFLATED
+        assert info.compress_size < info.file_size
+        assert zipf.read(info) == body
+
+
+def test_archive_missing_logs_folder(tmp_path, monkeypatch, capsys):
+    """Without a logs/ folder archiving is skipped and no archive is written."""
+    monkeypatch.chdir(tmp_path)
+
+    manage_cache_and_logs()
+
+    assert "No logs folder found" in capsys.readouterr().out
+    assert not (tmp_path / "logs_archive.zip").exists()
+
+
+# report_error tests
+
+def test_report_error_queues_without_sending(monkeypatch):
+    """Reports are only enqueued; the caller never waits on the network."""
+    q = queue.Queue(maxsize=2)
+    monkeypatch.setattr(network_ops, "_ERR_Q", q)
+
+    report_error("boom")
+    assert q.get_nowait() == "boom"
+
+
+def test_report_error_drops_when_queue_full(monkeypatch):
+    """A full queue drops the report and returns immediately instead of blocking."""
+    q = queue.Queue(maxsize=1)
+    q.put_nowait("earlier")
+    monkeypatch.setattr(network_ops, "_ERR_Q", q)
+
+    start = time.perf_counter()
+    report_error("dropped")
+    assert time.perf_counter() - start < 0.5
+    assert q.qsize() == 1 and q.get_nowait() == "earlier"
+
+
+# access_content tests
+
+def test_access_content_blocked_region():
+    """Blocked regions raise RegionBlockError."""
+    with pytest.raises(RegionBlockError):
+        access_content("US")
+
+
+def test_access_content_allowed_region(capsys):
+    """Other regions stream normally."""
+    access_content("IN")
+    assert "streamed successfully for region: IN" in capsys.readouterr().out
@@ -1,12 +1,29 @@
 """
 test_recommendations.py
 -----------------------
-Unit tests for recommendations.py: lookup_table, total_duration, kids_profile_filter.
+Unit tests for recommendations.py: lookup_table, total_duration, kids_profile_filter,
+and the struct-of-arrays catalog kernels.
 Uses pytest to validate expected behavior for typical, edge, and invalid input cases.
 """
 
+import json
+import subprocess
+import sys
+
 import pytest
-from src.recommendations import lookup_table, total_duration, kids_profile_filter
+from src import recommendations
+from src.recommendations import (
+    MOVIES_FILE,
+    load_movies,
+    load_movie_records,
+    MovieRecord,
+    lookup_table,
+    total_duration,
+    kids_profile_filter,
+    build_soa,
+    catalog_total_duration,
+    kids_profile_indices,
+)
 
 
 # lookup_table tests
@@ -45,6 +62,12 @@ def test_lookup_table_strips_whitespace():
     assert result == {"Space": "PG-13"}
 
 
+def test_lookup_table_loaded_catalog_matches_raw():
+    """Movies normalized by load_movies give the same table as raw input."""
+    raw = json.loads(MOVIES_FILE.read_text(encoding="utf-8"))
+    assert lookup_table(load_movies()) == lookup_table(raw)
+
+
 # total_duration tests
 
 def test_total_duration_basic():
@@ -84,6 +107,24 @@ def test_total_duration_negative_values():
     assert total_duration(playlist) == 120
 
 
+def test_total_duration_large_playlist():
+    """Large playlists (NumPy fast path when available) match the safe sum."""
+    playlist = [{"duration": 10}, {"duration": -5}, {"duration": "20"}, {}] * 100
+    assert total_duration(playlist) == 3000
+
+
+def test_total_duration_large_playlist_invalid_values():
+    """Invalid values in a large playlist still count as 0."""
+    playlist = [{"duration": 10}, {"duration": "abc"}, {"duration": None}] * 100
+    assert total_duration(playlist) == 1000
+
+
+def test_total_duration_large_playlist_no_int64_overflow():
+    """Sums past the int64 range are exact instead of wrapping."""
+    playlist = [{"duration": 2 ** 62}] * 300
+    assert total_duration(playlist) == 300 * 2 ** 62
+
+
 # kids_profile_filter tests 
 
 def test_kids_filter_basic():
@@ -116,4 +157,148 @@ def test_kids_filter_missing_rating():
     """Movies without rating are not filtered."""
     movies = [{}]
     result = kids_profile_filter(movies)
-    assert result == [{}]
\ No newline at end of file
+    assert result == [{}]
+
+
+def test_kids_filter_blocks_all_adult_ratings():
+    """NC-17, TV-MA and X are removed along with R."""
+    movies = [{"rating": r} for r in ("nc-17", " TV-MA", "X", "PG-13", "TV-14")]
+    result = kids_profile_filter(movies)
+    assert result == [{"rating": "PG-13"}, {"rating": "TV-14"}]
+
+
+def test_kids_filter_does_not_mutate_input():
+    """Repeated calls give the same result and leave caller dicts untouched."""
+    movies = [{"rating": " R "}, {"rating": "pg"}, {"rating": ["R"]}]
+    assert kids_profile_filter(movies) == kids_profile_filter(movies)
+    assert movies == [{"rating": " R "}, {"rating": "pg"}, {"rating": ["R"]}]
+
+
+def test_kids_filter_uses_precomputed_rating_code():
+    """Movies from load_movies carry a rating code; R-rated ones are removed."""
+    movies = load_movies()
+    assert movies and all("_rating_code" in m for m in movies)
+    assert all(m["rating"].strip().upper() != "R" for m in kids_profile_filter(movies))
+
+
+# load_movies tests
+
+def test_load_movies_cached_until_file_changes(tmp_path, monkeypatch):
+    """Repeat loads reuse the parsed catalog; rewriting the file invalidates it."""
+    catalog = tmp_path / "movies.json"
+    catalog.write_text('[{"title": "A", "rating": "G"}]', encoding="utf-8")
+    monkeypatch.setattr(recommendations, "MOVIES_FILE", catalog)
+
+    first, second = load_movies(), load_movies()
+    assert first == second and first is not second
+    assert first[0] is second[0]  # parsed once, dicts shared
+
+    catalog.write_text('[{"title": "B", "rating": "PG"}, {"title": "C"}]', encoding="utf-8")
+    assert [m["title"] for m in load_movies()] == ["B", "C"]
+
+
+def test_load_movies_missing_file(tmp_path, monkeypatch):
+    """A missing catalog yields an empty list."""
+    monkeypatch.setattr(recommendations, "MOVIES_FILE", tmp_path / "missing.json")
+    assert load_movies() == []
+
+
+@pytest.mark.parametrize("mmap_min_bytes", [1 << 20, 0])
+def test_load_movies_accepts_stdlib_json_extensions(tmp_path, monkeypatch, mmap_min_bytes):
+    """NaN (which orjson rejects) still loads, on both the read and the mmap branch."""
+    catalog = tmp_path / "movies.json"
+    catalog.write_text('[{"title": "A", "rating": "G", "duration": NaN}]', encoding="utf-8")
+    monkeypatch.setattr(recommendations, "MOVIES_FILE", catalog)
+    monkeypatch.setattr(recommendations, "MMAP_MIN_BYTES", mmap_min_bytes)
+
+    (movie,) = load_movies()
+    assert movie["title"] == "A" and movie["duration"] != movie["duration"]
+
+
+def test_load_movies_mmap_branch(tmp_path, monkeypatch):
+    """Catalogs at or above MMAP_MIN_BYTES parse from an mmap with the same result."""
+    pytest.importorskip("orjson")
+    catalog = tmp_path / "movies.json"
+    catalog.write_text('[{"title": " A ", "rating": "r", "duration": 90}]', encoding="utf-8")
+    monkeypatch.setattr(recommendations, "MOVIES_FILE", catalog)
+    monkeypatch.setattr(recommendations, "MMAP_MIN_BYTES", 0)
+
+    assert load_movies() == [{"title": "A", "rating": "r", "duration": 90, "_rating_code": 3}]
+
+
+@pytest.mark.parametrize(
+    "payload", ['{"title": "A"}', "null", "[1, 2]", '[{"title": "A"}, "oops"]']
+)
+def test_load_movies_wrong_shape(tmp_path, monkeypatch, caplog, payload):
+    """Valid JSON that is not a list of movie objects yields an empty list and logs an error."""
+    catalog = tmp_path / "movies.json"
+    catalog.write_text(payload, encoding="utf-8")
+    monkeypatch.setattr(recommendations, "MOVIES_FILE", catalog)
+    assert load_movies() == []
+    assert "not a list of movie objects" in caplog.text
+
+
+# MovieRecord tests
+
+def test_movie_record_from_dict_normalizes():
+    """Records apply the same defaults and duration safety as the dict helpers."""
+    record = MovieRecord.from_dict({"title": "  Up ", "duration": "-3"})
+    assert record == MovieRecord(title="Up", genre="", rating="NR", duration=0)
+    assert not hasattr(record, "__dict__")
+
+
+def test_load_movie_records_matches_load_movies():
+    """Loaded records line up with the raw catalog."""
+    records = load_movie_records()
+    assert [r.title for r in records] == [m["title"] for m in load_movies()]
+
+
+def test_record_functions_match_dict_functions():
+    """lookup_table, total_duration and kids_profile_filter accept records directly."""
+    movies = [
+        {"title": " A ", "rating": "PG", "duration": 90},
+        {"title": "B", "rating": " r ", "duration": "120"},
+        {"title": "C", "duration": -10},
+        {"title": "D", "rating": "TV-MA", "duration": 30},
+    ]
+    records = [MovieRecord.from_dict(m) for m in movies]
+
+    assert lookup_table(records) == lookup_table(movies)
+    assert total_duration(records) == total_duration(movies) == 240
+    assert [r.title for r in kids_profile_filter(records)] == ["A", "C"]
+
+
+# struct-of-arrays catalog tests
+
+def test_import_does_not_load_numpy_or_numba():
+    """NumPy/Numba are imported on first SoA use, not when the module is imported."""
+    code = (
+        "import sys, src.recommendations as r; r.lookup_table(r.load_movies()); "
+        "r.kids_profile_filter(r.load_movies()); "
+        "assert 'numpy' not in sys.modules and 'numba' not in sys.modules"
+    )
+    subprocess.run([sys.executable, "-c", code], cwd=recommendations.PROJECT_ROOT, check=True)
+
+
+def test_build_soa_matches_dict_functions():
+    """SoA kernels agree with the dict-based total_duration and kids filter."""
+    pytest.importorskip("numpy")
+    movies = [
+        {"title": "A", "rating": "PG", "duration": 90},
+        {"title": "B", "rating": " r ", "duration": "120"},
+        {"title": "C", "duration": -10},
+        {"title": "D", "rating": "G", "duration": "abc"},
+        {"title": "E", "rating": "TV-MA", "duration": 30},
+    ]
+    catalog = build_soa(movies)
+
+    assert catalog_total_duration(catalog) == total_duration(movies) == 240
+    kids = [catalog.movies[i] for i in kids_profile_indices(catalog)]
+    assert kids == kids_profile_filter(movies)
+
+
+def test_catalog_total_duration_no_int64_overflow():
+    """Packed catalogs whose total exceeds int64 still sum exactly."""
+    pytest.importorskip("numpy")
+    catalog = build_soa([{"duration": 2 ** 62}] * 300)
+    assert catalog_total_duration(catalog) == 300 * 2 ** 62
@@ -5,12 +5,14 @@ Basic unit tests for server_logs.py using pytest.
 
 Covers:
 - RecentlyWatched deque behavior
-- CommentStore defaultdict behavior
-- log_execution decorator runs
+- CommentStore grouping behavior
+- log_execution decorator runs and picks the right log level
 """
 
 import pytest
+import sys
 import time
+import logging
 from src.server_logs import RecentlyWatched, CommentStore, log_execution
 
 
@@ -52,6 +54,33 @@ def test_comment_store_add_and_get():
     assert cs.get_comments("VID2") == ["Nice episode"]
     assert cs.get_comments("VID3") == []  # no comments for VID3
 
+
+def test_comment_store_all_comments_grouped():
+    """Interleaved comments come back grouped per video, in insertion order."""
+    cs = CommentStore()
+    cs.add_comment("VID1", "a")
+    cs.add_comment("VID2", "b")
+    cs.add_comment("VID1", "c")
+
+    assert cs.all_comments() == {"VID1": ["a", "c"], "VID2": ["b"]}
+    assert cs.comments == cs.all_comments()
+
+
+def test_video_ids_and_titles_are_interned():
+    """Equal IDs/titles built at runtime end up as one shared string object."""
+    cs = CommentStore()
+    cs.add_comment("".join(["VID", "9"]), "x")
+    cs.add_comment("".join(["VID", "9"]), "y")
+    (video_id,) = cs.all_comments()
+    assert video_id is sys.intern("VID9")
+
+    rw = RecentlyWatched()
+    rw.add("".join(["Mo", "vie"]))
+    rw.add("".join(["Mo", "vie"]))
+    first, second = rw.get_history()
+    assert first is second
+
+
 def test_comment_store_invalid_input():
     """Invalid video_id or comment should raise errors."""
     cs = CommentStore()
@@ -63,6 +92,8 @@ def test_comment_store_invalid_input():
         cs.add_comment(123, "Comment") # video_id not string
     with pytest.raises(TypeError):
         cs.add_comment("VID1", 456)    # comment not string
+    with pytest.raises(ValueError):
+        cs.add_comment("VID1", "   ")  # whitespace-only comment
 
 
 # log_execution Decorator Test
@@ -81,4 +112,30 @@ def test_log_execution_runs():
 
     # Check return values
     assert fast_func() == 42
-    assert slow_func_demo() == "done"
\ No newline at end of file
+    assert slow_func_demo() == "done"
+
+
+def test_log_execution_levels(caplog):
+    """Fast calls log INFO; calls over one second log WARNING."""
+
+    @log_execution
+    def quick():
+        return None
+
+    @log_execution
+    def sluggish():
+        time.sleep(1.05)
+
+    # The module logger does not propagate, so capture on it directly
+    module_logger = logging.getLogger("src.server_logs")
+    caplog.set_level(logging.INFO, logger="src.server_logs")
+    module_logger.addHandler(caplog.handler)
+    try:
+        quick()
+        sluggish()
+    finally:
+        module_logger.removeHandler(caplog.handler)
+
+    assert not module_logger.propagate
+    levels = {r.getMessage().split()[0]: r.levelno for r in caplog.records}
+    assert levels == {"quick": logging.INFO, "sluggish": logging.WARNING}